@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+
+def cache_key(provider: str, model: str, mode: str, prompt: str) -> str:
+    payload = json.dumps(
+        {"p": provider, "m": model, "mode": mode, "prompt": prompt},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """Thread-safe exact-match LRU cache for provider responses.
+
+    A hit skips the provider HTTP round-trip entirely, so repeated prompts
+    cost a dict lookup instead of a network call.
+    """
+
+    def __init__(self, maxsize: int | None = None):
+        if maxsize is None:
+            maxsize = int(os.getenv("AGENT_CACHE_SIZE", "256"))
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def set(self, key: str, text: str) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = text
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+_shared_cache: LLMCache | None = None
+_shared_cache_lock = threading.Lock()
+
+
+def shared_cache() -> LLMCache:
+    """Process-wide cache shared by all provider instances."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = LLMCache()
+        return _shared_cache
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
-import json
 import os
-from urllib import error, request as urllib_request
+from typing import Iterator
 
+import urllib3
+
+from json_utils import dumps_bytes, loads
 from logger import RequestTrace
+from agent.cache import cache_key, shared_cache
+from agent.http import POOL, iter_sse_data
 from agent.modes import build_plan_prompt
 from agent.provider import AgentProvider, AgentRequest, AgentResponse
+from agent.semantic_cache import shared_semantic_cache
 from agent.tools import GithubTools
 
 
@@ -20,6 +25,9 @@ class ClaudeProvider(AgentProvider):
         self.tools = tools or GithubTools()
         self.api_key = api_key or os.getenv("CLAUDE_API_KEY")
         self.model = model or os.getenv("CLAUDE_MODEL", "claude-3-7-sonnet-latest")
+        self.plan_model = os.getenv("CLAUDE_PLAN_MODEL", "claude-3-5-haiku-latest")
+        self._cache = shared_cache()
+        self._semantic_cache = shared_semantic_cache()
 
         if not self.api_key:
             raise RuntimeError("Missing CLAUDE_API_KEY for AGENT_MODEL=claude")
@@ -29,47 +37,64 @@ class ClaudeProvider(AgentProvider):
         return "claude"
 
     def respond(self, request: AgentRequest, trace: RequestTrace | None = None) -> AgentResponse:
-        llm_span = trace.span("llm.call", provider=self.name, model=self.model, mode=request.mode) if trace else None
+        chosen_model = self.plan_model if request.mode == "plan" else self.model
+        llm_span = trace.span("llm.call", provider=self.name, model=chosen_model, mode=request.mode) if trace else None
+        key = cache_key(self.name, chosen_model, request.mode, request.prompt)
+        cached = self._cache.get(key)
+        if cached is not None:
+            if llm_span:
+                llm_span.event("cache.hit", status="ok")
+                llm_span.finish(status="ok", cached=True, text_length=len(cached))
+            return AgentResponse(provider=self.name, text=cached)
+
+        scope = (self.name, chosen_model, request.mode)
+        semantic = self._semantic_cache.get(scope, request.prompt)
+        if semantic is not None:
+            if llm_span:
+                llm_span.event("semantic_cache.hit", status="ok")
+                llm_span.finish(status="ok", cached=True, text_length=len(semantic))
+            return AgentResponse(provider=self.name, text=semantic)
+
         prompt = request.prompt
         if request.mode == "plan":
             prompt = build_plan_prompt(request.prompt)
 
         payload = {
-            "model": self.model,
+            "model": chosen_model,
             "max_tokens": 1024,
             "messages": [{"role": "user", "content": prompt}],
         }
-        req = urllib_request.Request(
-            "https://api.anthropic.com/v1/messages",
-            data=json.dumps(payload).encode("utf-8"),
-            headers={
-                "x-api-key": self.api_key,
-                "anthropic-version": "2023-06-01",
-                "Content-Type": "application/json",
-            },
-            method="POST",
-        )
-
         try:
             if llm_span:
                 llm_span.event("http.request.start", status="ok", endpoint="/v1/messages")
-            with urllib_request.urlopen(req, timeout=30) as response:
-                raw = response.read().decode("utf-8")
-                if llm_span:
-                    llm_span.event("http.request.success", status="ok", status_code=response.status)
-        except error.HTTPError as exc:
-            detail = exc.read().decode("utf-8", errors="replace")
+            response = POOL.request(
+                "POST",
+                "https://api.anthropic.com/v1/messages",
+                body=dumps_bytes(payload),
+                headers={
+                    "x-api-key": self.api_key,
+                    "anthropic-version": "2023-06-01",
+                    "Content-Type": "application/json",
+                },
+                preload_content=True,
+            )
+        except urllib3.exceptions.HTTPError as exc:
             if llm_span:
-                llm_span.event("http.request.error", status="error", status_code=exc.code, detail=detail)
+                llm_span.event("http.request.error", status="error", reason=str(exc))
                 llm_span.finish(status="error")
-            raise RuntimeError(f"Anthropic API error ({exc.code}): {detail}") from exc
-        except error.URLError as exc:
+            raise RuntimeError(f"Anthropic network error: {exc}") from exc
+
+        if response.status >= 400:
+            detail = response.data.decode("utf-8", errors="replace")
             if llm_span:
-                llm_span.event("http.request.error", status="error", reason=str(exc.reason))
+                llm_span.event("http.request.error", status="error", status_code=response.status, detail=detail)
                 llm_span.finish(status="error")
-            raise RuntimeError(f"Anthropic network error: {exc.reason}") from exc
+            raise RuntimeError(f"Anthropic API error ({response.status}): {detail}")
 
-        body = json.loads(raw)
+        if llm_span:
+            llm_span.event("http.request.success", status="ok", status_code=response.status)
+        # orjson parses bytes directly; only the final text ever becomes a str.
+        body = loads(response.data)
         content = body.get("content", [])
         parts = [item.get("text", "") for item in content if item.get("type") == "text"]
         text = "".join(parts).strip()
@@ -80,6 +105,68 @@ class ClaudeProvider(AgentProvider):
                 llm_span.finish(status="error")
             raise RuntimeError("Anthropic response missing text content")
 
+        self._cache.set(key, text)
+        self._semantic_cache.set(scope, request.prompt, text)
         if llm_span:
             llm_span.finish(status="ok", text_length=len(text))
         return AgentResponse(provider=self.name, text=text)
+
+    def respond_stream(self, request: AgentRequest, trace: RequestTrace | None = None) -> Iterator[str]:
+        chosen_model = self.plan_model if request.mode == "plan" else self.model
+        llm_span = trace.span("llm.stream", provider=self.name, model=chosen_model, mode=request.mode) if trace else None
+        prompt = request.prompt
+        if request.mode == "plan":
+            prompt = build_plan_prompt(request.prompt)
+
+        payload = {
+            "model": chosen_model,
+            "max_tokens": 1024,
+            "messages": [{"role": "user", "content": prompt}],
+            "stream": True,
+        }
+        try:
+            if llm_span:
+                llm_span.event("http.request.start", status="ok", endpoint="/v1/messages")
+            response = POOL.request(
+                "POST",
+                "https://api.anthropic.com/v1/messages",
+                body=dumps_bytes(payload),
+                headers={
+                    "x-api-key": self.api_key,
+                    "anthropic-version": "2023-06-01",
+                    "Content-Type": "application/json",
+                },
+                preload_content=False,
+            )
+        except urllib3.exceptions.HTTPError as exc:
+            if llm_span:
+                llm_span.event("http.request.error", status="error", reason=str(exc))
+                llm_span.finish(status="error")
+            raise RuntimeError(f"Anthropic network error: {exc}") from exc
+
+        if response.status >= 400:
+            detail = response.data.decode("utf-8", errors="replace")
+            if llm_span:
+                llm_span.event("http.request.error", status="error", status_code=response.status, detail=detail)
+                llm_span.finish(status="error")
+            raise RuntimeError(f"Anthropic API error ({response.status}): {detail}")
+
+        total_length = 0
+        try:
+            for data in iter_sse_data(response):
+                event = loads(data)
+                event_type = event.get("type")
+                if event_type == "message_stop":
+                    break
+                if event_type != "content_block_delta":
+                    continue
+                delta = event.get("delta", {})
+                text = delta.get("text")
+                if text:
+                    total_length += len(text)
+                    yield text
+        finally:
+            response.release_conn()
+
+        if llm_span:
+            llm_span.finish(status="ok", text_length=total_length)
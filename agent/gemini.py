@@ -1,20 +1,212 @@
 from __future__ import annotations
 
+import fnmatch
+import hashlib
 import json
 import os
+import random
 import re
-import socket
+import threading
 import time
-from typing import Any
-from urllib import error, parse, request as urllib_request
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Iterator
 
-from json_utils import extract_first_json_object
+import urllib3
+
+from json_utils import dumps_bytes, loads, strip_code_fences
 from logger import RequestTrace
+from agent.cache import cache_key, shared_cache
+from agent.http import POOL, iter_sse_data
 from agent.modes import build_plan_prompt
 from agent.provider import AgentProvider, AgentRequest, AgentResponse
+from agent.semantic_cache import shared_semantic_cache
 from agent.tools import GithubTools, PullRequestInput, RepoAccess, WriteFileInput
 
 
+# Tool-loop history controls: full payloads are kept only for the most recent
+# steps, and oversized tool results are truncated with a digest pointer, so the
+# per-step prompt grows linearly instead of quadratically across the loop.
+_HISTORY_RECENT_STEPS = 4
+_TOOL_RESULT_MAX_CHARS = 4096
+
+# Caps for the fused list_and_read tool so one call cannot flood the prompt.
+_LIST_AND_READ_MAX_FILES = 20
+_LIST_AND_READ_MAX_TOTAL_CHARS = 65536
+
+_GITHUB_URL_RE = re.compile(r"https://github\.com/([A-Za-z0-9_.-]+)/([A-Za-z0-9_.-]+)")
+_ANGLE_BRACKETS = str.maketrans({"<": " ", ">": " "})
+
+# raw_decode locates the end of the first JSON object in C, replacing the
+# Python-level brace/escape scanning previously done per model response.
+_ACTION_DECODER = json.JSONDecoder()
+
+
+# Content shorter than this is cheaper to repeat inline than to reference.
+_BLOB_MIN_CHARS = 256
+
+_SYSTEM_PROMPT = (
+    "You are an autonomous software agent. "
+    "You must output only valid JSON with one of these shapes:\n"
+    '1) {"type":"tool_call","tool":"<name>","arguments":{...}}\n'
+    '2) {"type":"final","message":"<final summary for user>"}\n\n'
+    "Available tools:\n"
+    "- get_default_branch: {}\n"
+    "- create_branch: {new_branch: string, from_branch?: string}\n"
+    "- list_files: {branch?: string}\n"
+    "- read_file: {path: string, branch?: string}\n"
+    "- list_and_read: {glob: string, limit?: number, branch?: string}\n"
+    "- write_file: {path: string, content: string, commit_message: string, branch?: string}\n"
+    "- create_pull_request: {title: string, body: string, head_branch: string, base_branch?: string}\n"
+    "- open_pr_with_diff: {title: string, body?: string, head_branch: string, base_branch?: string, "
+    "commit_message: string, files: [{path: string, content: string}]}\n\n"
+    "Workflow guidance:\n"
+    "1) Discover and read files with one list_and_read call (glob like 'src/*.py')\n"
+    "2) Read any remaining files individually if needed\n"
+    "3) Open the PR with one open_pr_with_diff call (it creates the branch, "
+    "commits every file, and opens the pull request)\n"
+    "When done, return a final summary including PR URL.\n"
+    "A tool result content of {\"ref\": \"<digest>\"} means the content is "
+    "identical to an earlier result carrying that content_digest.\n"
+    "Never include markdown code fences."
+)
+
+# Transient statuses worth retrying; other 4xx are caller errors and fail fast.
+_RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+_BACKOFF_CAP_SECONDS = 30.0
+
+
+def _retry_delay(attempt: int, retry_after: str | None) -> float:
+    """Backoff before the next attempt, honoring a server Retry-After hint.
+
+    Without a hint this is capped exponential backoff with a small jitter so
+    concurrent workers do not retry in lockstep.
+    """
+    if retry_after:
+        try:
+            return min(_BACKOFF_CAP_SECONDS, max(0.0, float(retry_after)))
+        except ValueError:
+            pass
+    return min(_BACKOFF_CAP_SECONDS, 0.5 * 2**attempt) + random.uniform(0, 0.25)
+
+
+def _content_digest(content: str) -> str:
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=12).hexdigest()
+
+
+def _dedupe_content(holder: dict[str, Any], blob_store: set[str]) -> None:
+    """Replace already-seen content with a digest reference, in place.
+
+    The full text enters the prompt exactly once; repeats (re-reading the
+    same file, re-listing the tree) cost a 24-char reference instead of the
+    whole payload again.
+    """
+    content = holder.get("content")
+    if not isinstance(content, str) or len(content) < _BLOB_MIN_CHARS:
+        return
+    digest = _content_digest(content)
+    if digest in blob_store:
+        holder["content"] = {"ref": digest}
+    else:
+        blob_store.add(digest)
+        holder["content_digest"] = digest
+
+
+def _dedupe_tool_result(tool_result: dict[str, Any], blob_store: set[str]) -> dict[str, Any]:
+    result = dict(tool_result)
+    _dedupe_content(result, blob_store)
+    files = result.get("files")
+    if isinstance(files, list):
+        result["files"] = [dict(item) if isinstance(item, dict) else item for item in files]
+        for item in result["files"]:
+            if isinstance(item, dict):
+                _dedupe_content(item, blob_store)
+    return result
+
+
+def _truncate_tool_result(tool_result: dict[str, Any]) -> dict[str, Any]:
+    content = tool_result.get("content")
+    if not isinstance(content, str) or len(content) <= _TOOL_RESULT_MAX_CHARS:
+        return tool_result
+    digest = _content_digest(content)
+    truncated = dict(tool_result)
+    truncated["content"] = content[:_TOOL_RESULT_MAX_CHARS] + "...[truncated]"
+    truncated["content_digest"] = digest
+    return truncated
+
+
+def _compact_history_entry(entry: dict[str, Any]) -> dict[str, Any]:
+    assistant = entry["assistant"]
+    if len(assistant) > 200:
+        assistant = assistant[:200] + "...[truncated]"
+    return {"assistant": assistant, "tool_result_keys": sorted(entry["tool_result"])}
+
+
+class _BatchQueue:
+    """Collects plan prompts for a short window and dispatches them together.
+
+    The public generateContent endpoint takes one prompt per call, so a
+    drained batch fans out concurrently over the shared connection pool.
+    Prompts are grouped into short/medium/long bins by estimated token count
+    so similar-sized requests ride together; the bins become single requests
+    if a server-side batch endpoint lands later.
+    """
+
+    window_seconds = 0.02
+    max_batch_size = 32
+
+    def __init__(self, generate, max_workers: int = 8):
+        self._generate = generate
+        self._pending: list[tuple[str, Any, Future]] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._thread: threading.Thread | None = None
+
+    def submit(self, prompt: str, trace_span=None) -> str:
+        future: Future = Future()
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._drain_loop, daemon=True)
+                self._thread.start()
+            self._pending.append((prompt, trace_span, future))
+        self._wakeup.set()
+        return future.result()
+
+    def _drain_loop(self) -> None:
+        while True:
+            self._wakeup.wait()
+            time.sleep(self.window_seconds)
+            with self._lock:
+                batch = self._pending[: self.max_batch_size]
+                del self._pending[: self.max_batch_size]
+                if not self._pending:
+                    self._wakeup.clear()
+            for bin_items in self._bin_by_length(batch):
+                for prompt, trace_span, future in bin_items:
+                    self._executor.submit(self._run_one, prompt, trace_span, future)
+
+    @staticmethod
+    def _bin_by_length(batch: list[tuple[str, Any, Future]]) -> list[list[tuple[str, Any, Future]]]:
+        bins: dict[str, list[tuple[str, Any, Future]]] = {"short": [], "medium": [], "long": []}
+        for item in batch:
+            estimated_tokens = len(item[0]) // 4
+            if estimated_tokens < 256:
+                bins["short"].append(item)
+            elif estimated_tokens < 1024:
+                bins["medium"].append(item)
+            else:
+                bins["long"].append(item)
+        return [items for items in bins.values() if items]
+
+    def _run_one(self, prompt: str, trace_span, future: Future) -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(self._generate(prompt, trace_span=trace_span))
+        except Exception as exc:
+            future.set_exception(exc)
+
+
 class GeminiProvider(AgentProvider):
     def __init__(
         self,
@@ -25,12 +217,29 @@ class GeminiProvider(AgentProvider):
         self.tools = tools or GithubTools()
         self.api_key = api_key or os.getenv("GEMINI_API_KEY")
         self.model = model or os.getenv("GEMINI_MODEL", "gemini-2.5-pro")
+        self.plan_model = os.getenv("GEMINI_PLAN_MODEL", "gemini-2.5-flash")
         self.request_timeout_seconds = 60
         self.max_retries = 2
+        self._cache = shared_cache()
+        self._semantic_cache = shared_semantic_cache()
+        self._plan_batcher = _BatchQueue(self._generate_plan_text)
 
         if not self.api_key:
             raise RuntimeError("Missing GEMINI_API_KEY for AGENT_MODEL=gemini")
 
+        # Precomputed once per model; the key travels in the x-goog-api-key
+        # header so it never appears in URLs (or anything that logs them).
+        self._endpoints = {}
+        self._stream_endpoints = {}
+        for name in {self.model, self.plan_model}:
+            base = f"https://generativelanguage.googleapis.com/v1beta/models/{name}"
+            self._endpoints[name] = f"{base}:generateContent"
+            self._stream_endpoints[name] = f"{base}:streamGenerateContent?alt=sse"
+        self._headers = {
+            "Content-Type": "application/json",
+            "x-goog-api-key": self.api_key,
+        }
+
     @property
     def name(self) -> str:
         return "gemini"
@@ -39,14 +248,46 @@ class GeminiProvider(AgentProvider):
         llm_span = trace.span("llm.workflow", provider=self.name, model=self.model, mode=request.mode) if trace else None
 
         if request.mode == "plan":
-            text = self._generate_text(build_plan_prompt(request.prompt), trace_span=llm_span)
+            key = cache_key(self.name, self.plan_model, request.mode, request.prompt)
+            cached = self._cache.get(key)
+            if cached is not None:
+                if llm_span:
+                    llm_span.event("cache.hit", status="ok")
+                    llm_span.finish(status="ok", mode="plan", cached=True, text_length=len(cached))
+                return AgentResponse(provider=self.name, text=cached)
+            scope = (self.name, self.plan_model, request.mode)
+            semantic = self._semantic_cache.get(scope, request.prompt)
+            if semantic is not None:
+                if llm_span:
+                    llm_span.event("semantic_cache.hit", status="ok")
+                    llm_span.finish(status="ok", mode="plan", cached=True, text_length=len(semantic))
+                return AgentResponse(provider=self.name, text=semantic)
+            text = self._plan_batcher.submit(build_plan_prompt(request.prompt), trace_span=llm_span)
+            self._cache.set(key, text)
+            self._semantic_cache.set(scope, request.prompt, text)
             if llm_span:
-                llm_span.finish(status="ok", mode="plan", text_length=len(text))
+                llm_span.finish(status="ok", mode="plan", model=self.plan_model, text_length=len(text))
             return AgentResponse(provider=self.name, text=text)
 
         access = self._extract_repo_access(request.prompt)
         if not access:
+            key = cache_key(self.name, self.model, request.mode, request.prompt)
+            cached = self._cache.get(key)
+            if cached is not None:
+                if llm_span:
+                    llm_span.event("cache.hit", status="ok")
+                    llm_span.finish(status="ok", mode="chat", cached=True, text_length=len(cached))
+                return AgentResponse(provider=self.name, text=cached)
+            scope = (self.name, self.model, request.mode)
+            semantic = self._semantic_cache.get(scope, request.prompt)
+            if semantic is not None:
+                if llm_span:
+                    llm_span.event("semantic_cache.hit", status="ok")
+                    llm_span.finish(status="ok", mode="chat", cached=True, text_length=len(semantic))
+                return AgentResponse(provider=self.name, text=semantic)
             text = self._generate_text(request.prompt, trace_span=llm_span)
+            self._cache.set(key, text)
+            self._semantic_cache.set(scope, request.prompt, text)
             if llm_span:
                 llm_span.finish(status="ok", mode="chat", text_length=len(text))
             return AgentResponse(provider=self.name, text=text)
@@ -56,8 +297,11 @@ class GeminiProvider(AgentProvider):
             self.tools.ensure_repo_write_access(access)
 
         history: list[dict[str, Any]] = []
+        serialized_history: list[str] = []
+        blob_store: set[str] = set()
+        prompt_prefix = self._build_tool_prompt_prefix(request.prompt, access)
         for step_index in range(12):
-            prompt = self._build_tool_prompt(request.prompt, access, history)
+            prompt = f'{prompt_prefix},"history":[{",".join(serialized_history)}]}}'
             step_span = llm_span.child("llm.step", index=step_index + 1) if llm_span else None
             model_text = self._generate_text(prompt, trace_span=step_span)
             action = self._parse_action(model_text, trace_span=step_span)
@@ -82,12 +326,16 @@ class GeminiProvider(AgentProvider):
             )
             if tool_span:
                 tool_span.finish(status="ok")
-            history.append(
-                {
-                    "assistant": model_text,
-                    "tool_result": tool_result,
-                }
-            )
+            entry = {
+                "assistant": model_text,
+                "tool_result": _truncate_tool_result(_dedupe_tool_result(tool_result, blob_store)),
+            }
+            history.append(entry)
+            # Serialize only the new entry; older ones were encoded on append.
+            serialized_history.append(dumps_bytes(entry).decode("utf-8"))
+            if len(history) > _HISTORY_RECENT_STEPS:
+                stale = len(history) - _HISTORY_RECENT_STEPS - 1
+                serialized_history[stale] = dumps_bytes(_compact_history_entry(history[stale])).decode("utf-8")
             if step_span:
                 step_span.finish(status="ok", action_type="tool_call")
 
@@ -98,54 +346,93 @@ class GeminiProvider(AgentProvider):
             text="I couldn't complete the workflow within the step limit.",
         )
 
-    def _generate_text(self, prompt: str, trace_span=None) -> str:
+    def respond_stream(self, request: AgentRequest, trace: RequestTrace | None = None) -> Iterator[str]:
+        # The tool workflow needs complete model turns; only plain generation streams.
+        if request.mode != "plan" and self._extract_repo_access(request.prompt):
+            yield self.respond(request, trace).text
+            return
+
+        chosen_model = self.plan_model if request.mode == "plan" else self.model
+        llm_span = trace.span("llm.stream", provider=self.name, model=chosen_model, mode=request.mode) if trace else None
+        prompt = request.prompt
+        if request.mode == "plan":
+            prompt = build_plan_prompt(request.prompt)
+
         payload = {"contents": [{"parts": [{"text": prompt}]}]}
-        encoded_key = parse.quote(self.api_key, safe="")
-        endpoint = (
-            "https://generativelanguage.googleapis.com/v1beta/models/"
-            f"{self.model}:generateContent?key={encoded_key}"
-        )
-        req = urllib_request.Request(
-            endpoint,
-            data=json.dumps(payload).encode("utf-8"),
-            headers={"Content-Type": "application/json"},
-            method="POST",
-        )
+        try:
+            if llm_span:
+                llm_span.event(
+                    "gemini.http.start",
+                    status="ok",
+                    endpoint=f"/models/{chosen_model}:streamGenerateContent",
+                )
+            response = POOL.request(
+                "POST",
+                self._stream_endpoints[chosen_model],
+                body=dumps_bytes(payload),
+                headers=self._headers,
+                timeout=urllib3.Timeout(connect=5, read=self.request_timeout_seconds),
+                preload_content=False,
+            )
+        except urllib3.exceptions.HTTPError as exc:
+            if llm_span:
+                llm_span.event("gemini.http.error", status="error", reason=str(exc))
+                llm_span.finish(status="error")
+            raise RuntimeError(f"Gemini network error: {exc}") from exc
+
+        if response.status >= 400:
+            detail = response.data.decode("utf-8", errors="replace")
+            if llm_span:
+                llm_span.event("gemini.http.error", status="error", status_code=response.status, detail=detail)
+                llm_span.finish(status="error")
+            raise RuntimeError(f"Gemini API error ({response.status}): {detail}")
+
+        total_length = 0
+        try:
+            for data in iter_sse_data(response):
+                chunk = loads(data)
+                for candidate in chunk.get("candidates", []):
+                    for part in candidate.get("content", {}).get("parts", []):
+                        text = part.get("text")
+                        if text:
+                            total_length += len(text)
+                            yield text
+        finally:
+            response.release_conn()
+
+        if llm_span:
+            llm_span.finish(status="ok", text_length=total_length)
 
-        raw = ""
+    def _generate_plan_text(self, prompt: str, trace_span=None) -> str:
+        return self._generate_text(prompt, trace_span=trace_span, model=self.plan_model)
+
+    def _generate_text(self, prompt: str, trace_span=None, model: str | None = None) -> str:
+        model = model or self.model
+        payload = {"contents": [{"parts": [{"text": prompt}]}]}
+        body_bytes = dumps_bytes(payload)
+        timeout = urllib3.Timeout(connect=5, read=self.request_timeout_seconds)
+
+        raw = b""
         last_error: Exception | None = None
         for attempt in range(self.max_retries + 1):
+            retry_after: str | None = None
             try:
                 if trace_span:
                     trace_span.event(
                         "gemini.http.start",
                         status="ok",
                         attempt=attempt + 1,
-                        endpoint=f"/models/{self.model}:generateContent",
-                    )
-                with urllib_request.urlopen(req, timeout=self.request_timeout_seconds) as response:
-                    raw = response.read().decode("utf-8")
-                    if trace_span:
-                        trace_span.event(
-                            "gemini.http.success",
-                            status="ok",
-                            attempt=attempt + 1,
-                            status_code=response.status,
-                        )
-                    last_error = None
-                    break
-            except error.HTTPError as exc:
-                detail = exc.read().decode("utf-8", errors="replace")
-                if trace_span:
-                    trace_span.event(
-                        "gemini.http.error",
-                        status="error",
-                        attempt=attempt + 1,
-                        status_code=exc.code,
-                        detail=detail,
+                        endpoint=f"/models/{model}:generateContent",
                     )
-                raise RuntimeError(f"Gemini API error ({exc.code}): {detail}") from exc
-            except (TimeoutError, socket.timeout) as exc:
+                response = POOL.request(
+                    "POST",
+                    self._endpoints[model],
+                    body=body_bytes,
+                    headers=self._headers,
+                    timeout=timeout,
+                    preload_content=True,
+                )
+            except urllib3.exceptions.TimeoutError:
                 if trace_span:
                     trace_span.event(
                         "gemini.http.error",
@@ -157,23 +444,49 @@ class GeminiProvider(AgentProvider):
                     f"Gemini request timed out after {self.request_timeout_seconds}s "
                     f"(attempt {attempt + 1}/{self.max_retries + 1})"
                 )
-            except error.URLError as exc:
+            except urllib3.exceptions.HTTPError as exc:
                 if trace_span:
                     trace_span.event(
                         "gemini.http.error",
                         status="error",
                         attempt=attempt + 1,
-                        reason=str(exc.reason),
+                        reason=str(exc),
                     )
-                last_error = RuntimeError(f"Gemini network error: {exc.reason}")
+                last_error = RuntimeError(f"Gemini network error: {exc}")
+            else:
+                if response.status >= 400:
+                    detail = response.data.decode("utf-8", errors="replace")
+                    if trace_span:
+                        trace_span.event(
+                            "gemini.http.error",
+                            status="error",
+                            attempt=attempt + 1,
+                            status_code=response.status,
+                            detail=detail,
+                        )
+                    if response.status not in _RETRYABLE_STATUSES:
+                        raise RuntimeError(f"Gemini API error ({response.status}): {detail}")
+                    last_error = RuntimeError(f"Gemini API error ({response.status}): {detail}")
+                    retry_after = response.headers.get("Retry-After")
+                else:
+                    raw = response.data
+                    if trace_span:
+                        trace_span.event(
+                            "gemini.http.success",
+                            status="ok",
+                            attempt=attempt + 1,
+                            status_code=response.status,
+                        )
+                    last_error = None
+                    break
 
             if attempt < self.max_retries:
-                time.sleep(1.5 * (attempt + 1))
+                time.sleep(_retry_delay(attempt, retry_after))
 
         if last_error:
             raise last_error
 
-        body = json.loads(raw)
+        body = loads(raw)
         candidates = body.get("candidates", [])
         texts: list[str] = []
         for candidate in candidates:
@@ -191,58 +504,45 @@ class GeminiProvider(AgentProvider):
         return combined
 
     def _extract_repo_access(self, prompt: str) -> RepoAccess | None:
-        cleaned = prompt.replace("<", " ").replace(">", " ")
-        match = re.search(r"https://github\.com/([A-Za-z0-9_.-]+)/([A-Za-z0-9_.-]+)", cleaned)
+        match = _GITHUB_URL_RE.search(prompt.translate(_ANGLE_BRACKETS))
         if not match:
             return None
         owner = match.group(1)
         repo = match.group(2).removesuffix(".git")
         return RepoAccess(owner=owner, repo=repo, branch="main")
 
-    def _build_tool_prompt(
-        self,
-        user_prompt: str,
-        access: RepoAccess,
-        history: list[dict[str, Any]],
-    ) -> str:
-        system = (
-            "You are an autonomous software agent. "
-            "You must output only valid JSON with one of these shapes:\n"
-            '1) {"type":"tool_call","tool":"<name>","arguments":{...}}\n'
-            '2) {"type":"final","message":"<final summary for user>"}\n\n'
-            "Available tools:\n"
-            "- get_default_branch: {}\n"
-            "- create_branch: {new_branch: string, from_branch?: string}\n"
-            "- list_files: {branch?: string}\n"
-            "- read_file: {path: string, branch?: string}\n"
-            "- write_file: {path: string, content: string, commit_message: string, branch?: string}\n"
-            "- create_pull_request: {title: string, body: string, head_branch: string, base_branch?: string}\n\n"
-            "Workflow guidance:\n"
-            "1) Discover files\n"
-            "2) Read relevant files\n"
-            "3) Create a branch if needed\n"
-            "4) Write updated file contents\n"
-            "5) Open PR\n"
-            "When done, return a final summary including PR URL.\n"
-            "Never include markdown code fences."
-        )
-        return json.dumps(
+    def _build_tool_prompt_prefix(self, user_prompt: str, access: RepoAccess) -> str:
+        """Serialize the invariant part of the tool-loop prompt once per request.
+
+        The system prompt, repo access, and user request never change across
+        loop steps, so the envelope is encoded once and each step only splices
+        in the history tail. Keeping the invariant fields first and the
+        history last also lets any server-side prompt-prefix cache hit on the
+        stable prefix.
+        """
+        envelope = dumps_bytes(
             {
-                "system": system,
+                "system": _SYSTEM_PROMPT,
                 "repo": access.model_dump(),
                 "request": user_prompt,
-                "history": history,
-                "timestamp": int(time.time()),
             }
-        )
+        ).decode("utf-8")
+        return envelope[:-1]
 
     def _parse_action(self, model_text: str, trace_span=None) -> dict[str, Any]:
+        candidate = strip_code_fences(model_text)
         try:
-            payload, trailing = extract_first_json_object(model_text)
+            start = candidate.find("{")
+            if start == -1:
+                raise ValueError("No JSON object found in text")
+            payload, end = _ACTION_DECODER.raw_decode(candidate, start)
+            if not isinstance(payload, dict):
+                raise ValueError("Top-level JSON payload must be an object")
         except ValueError as exc:
             if trace_span:
                 trace_span.event("gemini.action.parse.error", status="error", error=str(exc), raw=model_text)
             raise RuntimeError(f"Gemini response is not JSON: {model_text}") from exc
+        trailing = candidate[end:].strip()
 
         if trailing and trace_span:
             trace_span.event("gemini.action.trailing_text", status="warn", trailing=trailing)
@@ -297,6 +597,23 @@ class GeminiProvider(AgentProvider):
             )
             return {"path": arguments["path"], "content": content}
 
+        if tool_name == "list_and_read":
+            # Fused discover+read: saves one LLM round-trip per file touched.
+            branch = arguments.get("branch")
+            files = self.tools.list_files(access, branch=branch)
+            limit = min(int(arguments.get("limit", 20)), _LIST_AND_READ_MAX_FILES)
+            selected = fnmatch.filter(files, arguments["glob"])[:limit]
+            contents = self.tools.read_files_bulk(access, selected, branch=branch)
+            results = []
+            remaining = _LIST_AND_READ_MAX_TOTAL_CHARS
+            for path, content in zip(selected, contents):
+                if remaining <= 0:
+                    break
+                content = content[: min(_TOOL_RESULT_MAX_CHARS, remaining)]
+                remaining -= len(content)
+                results.append({"path": path, "content": content})
+            return {"files": results, "matched": len(selected), "total_files": len(files)}
+
         if tool_name == "write_file":
             payload = WriteFileInput.model_validate(arguments)
             commit_sha = self.tools.write_file(access, payload)
@@ -307,4 +624,34 @@ class GeminiProvider(AgentProvider):
             url = self.tools.create_pull_request(access, payload)
             return {"pull_request_url": url}
 
+        if tool_name == "open_pr_with_diff":
+            # Fused branch+commit+PR: collapses 2+N tool turns into one.
+            head_branch = self.tools.create_branch(
+                access,
+                arguments["head_branch"],
+                from_branch=arguments.get("base_branch"),
+            )
+            commits = []
+            for file_change in arguments["files"]:
+                write_payload = WriteFileInput(
+                    path=file_change["path"],
+                    content=file_change["content"],
+                    commit_message=arguments["commit_message"],
+                    branch=head_branch,
+                )
+                commits.append(
+                    {
+                        "path": write_payload.path,
+                        "commit_sha": self.tools.write_file(access, write_payload),
+                    }
+                )
+            pr_payload = PullRequestInput(
+                title=arguments["title"],
+                body=arguments.get("body", ""),
+                head_branch=head_branch,
+                base_branch=arguments.get("base_branch") or self.tools.get_default_branch(access),
+            )
+            url = self.tools.create_pull_request(access, pr_payload)
+            return {"pull_request_url": url, "commits": commits}
+
         raise RuntimeError(f"Unknown tool requested by Gemini: {tool_name}")
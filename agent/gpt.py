@@ -1,12 +1,17 @@
 from __future__ import annotations
 
-import json
 import os
-from urllib import error, request as urllib_request
+from typing import Iterator
 
+import urllib3
+
+from json_utils import dumps_bytes, loads
 from logger import RequestTrace
+from agent.cache import cache_key, shared_cache
+from agent.http import POOL, iter_sse_data
 from agent.modes import build_plan_prompt
 from agent.provider import AgentProvider, AgentRequest, AgentResponse
+from agent.semantic_cache import shared_semantic_cache
 from agent.tools import GithubTools
 
 
@@ -20,6 +25,9 @@ class GPTProvider(AgentProvider):
         self.tools = tools or GithubTools()
         self.api_key = api_key or os.getenv("GPT_API_KEY")
         self.model = model or os.getenv("GPT_MODEL", "gpt-4o-mini")
+        self.plan_model = os.getenv("GPT_PLAN_MODEL", "gpt-4o-mini")
+        self._cache = shared_cache()
+        self._semantic_cache = shared_semantic_cache()
 
         if not self.api_key:
             raise RuntimeError("Missing GPT_API_KEY for AGENT_MODEL=gpt")
@@ -29,44 +37,62 @@ class GPTProvider(AgentProvider):
         return "gpt"
 
     def respond(self, request: AgentRequest, trace: RequestTrace | None = None) -> AgentResponse:
-        llm_span = trace.span("llm.call", provider=self.name, model=self.model, mode=request.mode) if trace else None
+        chosen_model = self.plan_model if request.mode == "plan" else self.model
+        llm_span = trace.span("llm.call", provider=self.name, model=chosen_model, mode=request.mode) if trace else None
+        key = cache_key(self.name, chosen_model, request.mode, request.prompt)
+        cached = self._cache.get(key)
+        if cached is not None:
+            if llm_span:
+                llm_span.event("cache.hit", status="ok")
+                llm_span.finish(status="ok", cached=True, text_length=len(cached))
+            return AgentResponse(provider=self.name, text=cached)
+
+        scope = (self.name, chosen_model, request.mode)
+        semantic = self._semantic_cache.get(scope, request.prompt)
+        if semantic is not None:
+            if llm_span:
+                llm_span.event("semantic_cache.hit", status="ok")
+                llm_span.finish(status="ok", cached=True, text_length=len(semantic))
+            return AgentResponse(provider=self.name, text=semantic)
+
         prompt = request.prompt
         if request.mode == "plan":
             prompt = build_plan_prompt(request.prompt)
 
         payload = {
-            "model": self.model,
+            "model": chosen_model,
             "input": prompt,
         }
-        req = urllib_request.Request(
-            "https://api.openai.com/v1/responses",
-            data=json.dumps(payload).encode("utf-8"),
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            },
-            method="POST",
-        )
         try:
             if llm_span:
                 llm_span.event("http.request.start", status="ok", endpoint="/v1/responses")
-            with urllib_request.urlopen(req, timeout=30) as response:
-                raw = response.read().decode("utf-8")
-                if llm_span:
-                    llm_span.event("http.request.success", status="ok", status_code=response.status)
-        except error.HTTPError as exc:
-            detail = exc.read().decode("utf-8", errors="replace")
+            response = POOL.request(
+                "POST",
+                "https://api.openai.com/v1/responses",
+                body=dumps_bytes(payload),
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json",
+                },
+                preload_content=True,
+            )
+        except urllib3.exceptions.HTTPError as exc:
             if llm_span:
-                llm_span.event("http.request.error", status="error", status_code=exc.code, detail=detail)
+                llm_span.event("http.request.error", status="error", reason=str(exc))
                 llm_span.finish(status="error")
-            raise RuntimeError(f"OpenAI API error ({exc.code}): {detail}") from exc
-        except error.URLError as exc:
+            raise RuntimeError(f"OpenAI network error: {exc}") from exc
+
+        if response.status >= 400:
+            detail = response.data.decode("utf-8", errors="replace")
             if llm_span:
-                llm_span.event("http.request.error", status="error", reason=str(exc.reason))
+                llm_span.event("http.request.error", status="error", status_code=response.status, detail=detail)
                 llm_span.finish(status="error")
-            raise RuntimeError(f"OpenAI network error: {exc.reason}") from exc
+            raise RuntimeError(f"OpenAI API error ({response.status}): {detail}")
 
-        body = json.loads(raw)
+        if llm_span:
+            llm_span.event("http.request.success", status="ok", status_code=response.status)
+        # orjson parses bytes directly; only the final text ever becomes a str.
+        body = loads(response.data)
         text = body.get("output_text")
 
         if not text:
@@ -75,6 +101,63 @@ class GPTProvider(AgentProvider):
                 llm_span.finish(status="error")
             raise RuntimeError("OpenAI response missing output_text")
 
+        self._cache.set(key, text)
+        self._semantic_cache.set(scope, request.prompt, text)
         if llm_span:
             llm_span.finish(status="ok", text_length=len(text))
         return AgentResponse(provider=self.name, text=text)
+
+    def respond_stream(self, request: AgentRequest, trace: RequestTrace | None = None) -> Iterator[str]:
+        chosen_model = self.plan_model if request.mode == "plan" else self.model
+        llm_span = trace.span("llm.stream", provider=self.name, model=chosen_model, mode=request.mode) if trace else None
+        prompt = request.prompt
+        if request.mode == "plan":
+            prompt = build_plan_prompt(request.prompt)
+
+        payload = {
+            "model": chosen_model,
+            "input": prompt,
+            "stream": True,
+        }
+        try:
+            if llm_span:
+                llm_span.event("http.request.start", status="ok", endpoint="/v1/responses")
+            response = POOL.request(
+                "POST",
+                "https://api.openai.com/v1/responses",
+                body=dumps_bytes(payload),
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json",
+                },
+                preload_content=False,
+            )
+        except urllib3.exceptions.HTTPError as exc:
+            if llm_span:
+                llm_span.event("http.request.error", status="error", reason=str(exc))
+                llm_span.finish(status="error")
+            raise RuntimeError(f"OpenAI network error: {exc}") from exc
+
+        if response.status >= 400:
+            detail = response.data.decode("utf-8", errors="replace")
+            if llm_span:
+                llm_span.event("http.request.error", status="error", status_code=response.status, detail=detail)
+                llm_span.finish(status="error")
+            raise RuntimeError(f"OpenAI API error ({response.status}): {detail}")
+
+        total_length = 0
+        try:
+            for data in iter_sse_data(response):
+                if data == "[DONE]":
+                    break
+                event = loads(data)
+                if event.get("type") == "response.output_text.delta":
+                    delta = event.get("delta")
+                    if delta:
+                        total_length += len(delta)
+                        yield delta
+        finally:
+            response.release_conn()
+
+        if llm_span:
+            llm_span.finish(status="ok", text_length=total_length)
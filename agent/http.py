@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import os
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import urllib3
+from urllib3.connection import HTTPConnection
+
+# Provider API hosts; used to pre-establish TLS connections at startup.
+_API_ORIGINS = (
+    "https://api.openai.com/",
+    "https://api.anthropic.com/",
+    "https://generativelanguage.googleapis.com/",
+)
+
+# Shared across all providers so repeat calls to the same API host reuse a
+# warm TLS connection instead of paying a fresh TCP+TLS handshake per call.
+# TCP_NODELAY disables Nagle buffering, which otherwise delays our small
+# JSON POST bodies.
+POOL = urllib3.PoolManager(
+    num_pools=8,
+    maxsize=32,
+    retries=False,
+    timeout=urllib3.Timeout(connect=5, read=30),
+    socket_options=HTTPConnection.default_socket_options
+    + [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)],
+)
+
+
+# Bounded executor for offloading blocking provider calls from async
+# callers; the cap keeps a burst of Slack events from spawning an unbounded
+# number of threads all holding sockets.
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("AGENT_HTTP_WORKERS", "16")),
+    thread_name_prefix="agent-http",
+)
+
+
+def executor() -> ThreadPoolExecutor:
+    """The shared executor used by AgentProvider.respond_async."""
+    return _EXECUTOR
+
+
+def warmup() -> None:
+    """Pre-open one connection per API host so the first user request does
+    not pay the TCP+TLS handshake.
+
+    Runs in a daemon thread and ignores failures: a host being unreachable
+    at startup just means the first real call connects the usual way.
+    """
+
+    def _connect() -> None:
+        for origin in _API_ORIGINS:
+            try:
+                POOL.request("HEAD", origin, timeout=urllib3.Timeout(connect=5, read=5))
+            except Exception:
+                pass
+
+    threading.Thread(target=_connect, name="http-warmup", daemon=True).start()
+
+
+def iter_sse_data(response):
+    """Yield the data payload of each server-sent event from a streaming response.
+
+    Expects a urllib3 response opened with preload_content=False. Lines other
+    than `data:` (event names, comments, keep-alives) are skipped.
+    """
+    buffer = b""
+    for chunk in response.stream(1024):
+        buffer += chunk
+        while b"\n" in buffer:
+            line, buffer = buffer.split(b"\n", 1)
+            line = line.strip()
+            if line.startswith(b"data:"):
+                payload = line[5:].strip()
+                if payload:
+                    yield payload.decode("utf-8")
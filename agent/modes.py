@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import json
+import re
+
 from pydantic import BaseModel, ConfigDict
 
 from agent.plan_schema import PlanSchema
@@ -36,22 +39,33 @@ CODE_HINTS = (
     "pr",
 )
 
+# Single compiled alternation per hint group: one C-level pass over the prompt
+# instead of one substring scan per hint.
+_PLAN_RE = re.compile("|".join(re.escape(hint) for hint in PLAN_HINTS))
+_CODE_RE = re.compile("|".join(re.escape(hint) for hint in CODE_HINTS))
+
+
 def detect_mode(prompt: str) -> ModeDecision:
     normalized = prompt.strip().lower()
-    for hint in PLAN_HINTS:
-        if hint in normalized:
-            return ModeDecision(mode="plan", reason=f"matched_hint:{hint}")
-    for hint in CODE_HINTS:
-        if hint in normalized:
-            return ModeDecision(mode="plan", reason=f"matched_code_hint:{hint}")
+    match = _PLAN_RE.search(normalized)
+    if match:
+        return ModeDecision(mode="plan", reason=f"matched_hint:{match.group(0)}")
+    match = _CODE_RE.search(normalized)
+    if match:
+        return ModeDecision(mode="plan", reason=f"matched_code_hint:{match.group(0)}")
     return ModeDecision(mode="chat", reason="default")
 
 
+# The schema is immutable, so serialize it once at import instead of walking
+# the pydantic model graph on every plan request.
+_PLAN_SCHEMA_JSON = json.dumps(PlanSchema.model_json_schema(), separators=(",", ":"))
+_PLAN_PROMPT_PREFIX = (
+    "You are in plan mode. Analyze the request and return only JSON matching this schema. "
+    "Do not include markdown fences or commentary.\n\n"
+    f"Schema:\n{_PLAN_SCHEMA_JSON}\n\n"
+    "User request:\n"
+)
+
+
 def build_plan_prompt(user_prompt: str) -> str:
-    schema = PlanSchema.model_json_schema()
-    return (
-        "You are in plan mode. Analyze the request and return only JSON matching this schema. "
-        "Do not include markdown fences or commentary.\n\n"
-        f"Schema:\n{schema}\n\n"
-        f"User request:\n{user_prompt}"
-    )
+    return _PLAN_PROMPT_PREFIX + user_prompt
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from pydantic import BaseModel, ConfigDict, Field
 
-from json_utils import extract_first_json_object
+from json_utils import extract_first_json_object, strip_code_fences
 
 
 class PlanStep(BaseModel):
@@ -24,6 +24,19 @@ class PlanSchema(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
 
+# The compiled core validator; calling it directly skips the model_validate
+# classmethod shim on every parsed plan.
+_CORE = PlanSchema.__pydantic_validator__
+
+
 def parse_plan_response(text: str) -> PlanSchema:
-    payload, _trailing = extract_first_json_object(text)
-    return PlanSchema.model_validate(payload)
+    candidate = strip_code_fences(text)
+    # Fast path: a response that is exactly one JSON object validates straight
+    # from the string in pydantic-core, skipping the intermediate dict.
+    if candidate.startswith("{") and candidate.endswith("}"):
+        try:
+            return _CORE.validate_json(candidate)
+        except ValueError:
+            pass
+    payload, _trailing = extract_first_json_object(candidate)
+    return _CORE.validate_python(payload)
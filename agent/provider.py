@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Iterator
 
 from pydantic import BaseModel, ConfigDict, Field
 
 from logger import RequestTrace
+from agent.http import executor
 
 
 class AgentRequest(BaseModel):
@@ -33,3 +35,25 @@ class AgentProvider(ABC):
     def respond(self, request: AgentRequest, trace: RequestTrace | None = None) -> AgentResponse:
         """Return a provider response for the given request."""
         pass
+
+    async def respond_async(self, request: AgentRequest, trace: RequestTrace | None = None) -> AgentResponse:
+        """Respond without blocking the caller's event loop.
+
+        The providers use a blocking HTTP client, so the call is offloaded to
+        the shared bounded executor from agent.http; multiple in-flight
+        requests overlap on network IO without spawning unbounded threads.
+        Cancelling the awaiting task abandons the worker but cannot abort an
+        in-flight socket read; the pool's read timeout bounds how long the
+        worker stays busy.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor(), self.respond, request, trace)
+
+    def respond_stream(self, request: AgentRequest, trace: RequestTrace | None = None) -> Iterator[str]:
+        """Yield response text incrementally as the model produces it.
+
+        Providers that support server-side streaming override this so the
+        first tokens arrive before generation finishes; the default yields
+        the full response once.
+        """
+        yield self.respond(request, trace).text
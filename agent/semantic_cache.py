@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import math
+import os
+import re
+import threading
+from collections import Counter
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_DIGIT_RE = re.compile(r"[0-9]")
+
+Scope = tuple[str, str, str]
+
+
+def _vectorize(prompt: str) -> Counter:
+    return Counter(_TOKEN_RE.findall(prompt.lower()))
+
+
+def _critical_tokens(vector: Counter) -> frozenset[str]:
+    """Tokens that must match exactly for two prompts to be interchangeable.
+
+    Digit-bearing tokens (branch names, versions, issue numbers) carry the
+    whole meaning of a prompt while contributing almost nothing to cosine
+    similarity, so they are compared as a set rather than by weight.
+    """
+    return frozenset(token for token in vector if _DIGIT_RE.search(token))
+
+
+def _cosine(a: Counter, b: Counter) -> float:
+    if not a or not b:
+        return 0.0
+    if len(b) < len(a):
+        a, b = b, a
+    dot = sum(count * b[token] for token, count in a.items())
+    if not dot:
+        return 0.0
+    norm_a = math.sqrt(sum(count * count for count in a.values()))
+    norm_b = math.sqrt(sum(count * count for count in b.values()))
+    return dot / (norm_a * norm_b)
+
+
+class SemanticCache:
+    """Near-duplicate prompt cache layered behind the exact-match LLMCache.
+
+    Prompts are embedded as bag-of-words count vectors and matched by cosine
+    similarity, which catches light rephrasings ("make a plan for X" vs
+    "write a plan for X") without any model call or extra dependency.
+    Entries are scoped by (provider, model, mode) so responses never cross
+    providers or modes, and prompts whose digit-bearing tokens differ
+    (branch names, versions) never match each other.
+
+    Lexical similarity is coarser than embeddings: a single-word swap
+    ("staging" vs "production") scores in the same band as a harmless
+    rephrasing, so the cache is disabled unless AGENT_SEMANTIC_CACHE=1 is
+    set, and the default threshold only admits near-identical prompts
+    (insertions and reorderings, not substitutions).
+    """
+
+    def __init__(self, threshold: float | None = None, maxsize: int | None = None):
+        if threshold is None:
+            threshold = float(os.getenv("AGENT_SEMANTIC_CACHE_THRESHOLD", "0.95"))
+        if maxsize is None:
+            maxsize = int(os.getenv("AGENT_SEMANTIC_CACHE_SIZE", "128"))
+        self.enabled = os.getenv("AGENT_SEMANTIC_CACHE") == "1"
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self._entries: list[tuple[Scope, Counter, frozenset[str], str]] = []
+        self._lock = threading.Lock()
+
+    def get(self, scope: Scope, prompt: str) -> str | None:
+        if not self.enabled:
+            return None
+        vector = _vectorize(prompt)
+        critical = _critical_tokens(vector)
+        best_score = 0.0
+        best_text: str | None = None
+        with self._lock:
+            for entry_scope, entry_vector, entry_critical, entry_text in self._entries:
+                if entry_scope != scope or entry_critical != critical:
+                    continue
+                score = _cosine(vector, entry_vector)
+                if score > best_score:
+                    best_score = score
+                    best_text = entry_text
+        if best_score >= self.threshold:
+            return best_text
+        return None
+
+    def set(self, scope: Scope, prompt: str, text: str) -> None:
+        if not self.enabled or self.maxsize <= 0:
+            return
+        with self._lock:
+            vector = _vectorize(prompt)
+            self._entries.append((scope, vector, _critical_tokens(vector), text))
+            while len(self._entries) > self.maxsize:
+                self._entries.pop(0)
+
+
+_shared_cache: SemanticCache | None = None
+_shared_cache_lock = threading.Lock()
+
+
+def shared_semantic_cache() -> SemanticCache:
+    """Process-wide semantic cache shared by all provider instances."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = SemanticCache()
+        return _shared_cache
@@ -1,6 +1,8 @@
+import io
 import os
 
 from agent import get_provider
+from agent.http import warmup
 from agent.modes import detect_mode
 from agent.plan_schema import PlanSchema, parse_plan_response
 from agent.provider import AgentRequest
@@ -100,35 +102,38 @@ def handle_event(event: dict, say) -> None:
 
 
 def format_plan_for_slack(plan: PlanSchema) -> str:
-    lines = [
-        "*Plan Mode Output*",
-        f"*Objective*: {plan.objective}",
-        "",
-    ]
+    # One growable buffer instead of intermediate bullet lists plus a join.
+    buf = io.StringIO()
+    write = buf.write
+    write("*Plan Mode Output*\n")
+    write(f"*Objective*: {plan.objective}\n\n")
     if plan.assumptions:
-        lines.append("*Assumptions*")
-        lines.extend([f"- {item}" for item in plan.assumptions])
-        lines.append("")
+        write("*Assumptions*\n")
+        for item in plan.assumptions:
+            write(f"- {item}\n")
+        write("\n")
     if plan.files_to_touch:
-        lines.append("*Files To Touch*")
-        lines.extend([f"- `{item}`" for item in plan.files_to_touch])
-        lines.append("")
-    lines.append("*Implementation Steps*")
+        write("*Files To Touch*\n")
+        for item in plan.files_to_touch:
+            write(f"- `{item}`\n")
+        write("\n")
+    write("*Implementation Steps*\n")
     for index, step in enumerate(plan.implementation_steps, start=1):
-        lines.append(f"{index}. {step.title}: {step.details}")
+        write(f"{index}. {step.title}: {step.details}\n")
     if plan.risks:
-        lines.append("")
-        lines.append("*Risks*")
-        lines.extend([f"- {item}" for item in plan.risks])
+        write("\n*Risks*\n")
+        for item in plan.risks:
+            write(f"- {item}\n")
     if plan.test_plan:
-        lines.append("")
-        lines.append("*Test Plan*")
-        lines.extend([f"- {item}" for item in plan.test_plan])
+        write("\n*Test Plan*\n")
+        for item in plan.test_plan:
+            write(f"- {item}\n")
     if plan.rollback_plan:
-        lines.append("")
-        lines.append("*Rollback Plan*")
-        lines.extend([f"- {item}" for item in plan.rollback_plan])
-    return "\n".join(lines)
+        write("\n*Rollback Plan*\n")
+        for item in plan.rollback_plan:
+            write(f"- {item}\n")
+    # Every line above ends with \n; drop the final one to match join() output.
+    return buf.getvalue()[:-1]
 
 
 @app.event("app_mention")
@@ -152,4 +157,5 @@ def on_message(event, say):
 
 
 if __name__ == "__main__":
+    warmup()
     SocketModeHandler(app, APP_TOKEN).start()
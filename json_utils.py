@@ -1,13 +1,51 @@
 from __future__ import annotations
 
 import json
+import re
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is a declared dependency
+    orjson = None
+
+
+def dumps_bytes(payload: Any) -> bytes:
+    """Serialize to compact JSON bytes, via orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_pretty(payload: Any) -> str:
+    """Serialize to 2-space-indented JSON text, via orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(payload, indent=2, ensure_ascii=False)
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse JSON from str or bytes, via orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Matches a fully fenced block in one pass, capturing the body without the
+# splitlines/join round-trip.
+_FENCE_RE = re.compile(r"\A\s*```[^\n]*\n(.*?)\n?```\s*\Z", re.DOTALL)
 
 
 def strip_code_fences(text: str) -> str:
+    match = _FENCE_RE.match(text)
+    if match:
+        return match.group(1).strip()
+
     stripped = text.strip()
     if not stripped.startswith("```"):
         return stripped
 
+    # Unclosed or oddly indented fences fall back to line surgery.
     lines = stripped.splitlines()
     if lines and lines[0].startswith("```"):
         lines = lines[1:]
@@ -16,43 +54,21 @@ def strip_code_fences(text: str) -> str:
     return "\n".join(lines).strip()
 
 
+# raw_decode scans and parses the first JSON value in one C-level pass,
+# replacing the Python-level brace/escape state machine this used to run.
+_DECODER = json.JSONDecoder()
+
+
 def extract_first_json_object(text: str) -> tuple[dict, str]:
     candidate = strip_code_fences(text)
     start = candidate.find("{")
     if start == -1:
         raise ValueError("No JSON object found in text")
 
-    depth = 0
-    in_string = False
-    escaped = False
-    end = -1
-
-    for index, char in enumerate(candidate[start:], start=start):
-        if in_string:
-            if escaped:
-                escaped = False
-            elif char == "\\":
-                escaped = True
-            elif char == '"':
-                in_string = False
-            continue
-
-        if char == '"':
-            in_string = True
-        elif char == "{":
-            depth += 1
-        elif char == "}":
-            depth -= 1
-            if depth == 0:
-                end = index
-                break
-
-    if end == -1:
-        raise ValueError("Unterminated JSON object in text")
-
-    raw = candidate[start : end + 1]
-    trailing = candidate[end + 1 :].strip()
-    payload = json.loads(raw)
+    try:
+        payload, end = _DECODER.raw_decode(candidate, start)
+    except json.JSONDecodeError as exc:
+        raise ValueError("Unterminated JSON object in text") from exc
     if not isinstance(payload, dict):
         raise ValueError("Top-level JSON payload must be an object")
-    return payload, trailing
+    return payload, candidate[end:].strip()
@@ -1,21 +1,51 @@
 from __future__ import annotations
 
-import json
+import atexit
+import os
+import queue
+import re
+import sys
+import threading
 import time
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any
 
+from json_utils import dumps_bytes, dumps_pretty
+
+
+_UTC = timezone.utc
+
+# Events within one millisecond share a timestamp string, so memoize the last
+# formatted value; fast spans emit several events per ms and skip the datetime
+# allocation and isoformat() work entirely.
+_last_ms = 0
+_last_iso = ""
+
+
+def _iso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, _UTC).isoformat(timespec="milliseconds")
+
 
 def _utc_now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat()
+    global _last_ms, _last_iso
+    now_ms = time.time_ns() // 1_000_000
+    if now_ms != _last_ms:
+        _last_ms = now_ms
+        _last_iso = datetime.fromtimestamp(now_ms / 1000, _UTC).isoformat(timespec="milliseconds")
+    return _last_iso
+
+
+# One C-level scan instead of a lower() copy plus four substring passes per
+# string visited. Redaction runs before truncation so a secret past the
+# truncation point still redacts the whole value.
+_SENSITIVE_RE = re.compile(r"token|authorization|api[_-]?key|secret", re.IGNORECASE)
 
 
 def _safe_value(value: Any) -> Any:
     if isinstance(value, str):
-        lowered = value.lower()
-        if any(token in lowered for token in ("token", "authorization", "api_key", "secret")):
+        if _SENSITIVE_RE.search(value):
             return "[REDACTED]"
         if len(value) > 2000:
             return value[:2000] + "...[truncated]"
@@ -27,7 +57,7 @@ def _safe_value(value: Any) -> Any:
     return value
 
 
-@dataclass
+@dataclass(slots=True)
 class TraceEvent:
     name: str
     status: str
@@ -39,27 +69,29 @@ class TraceEvent:
             "name": self.name,
             "status": self.status,
             "timestamp": self.timestamp,
-            "data": _safe_value(self.data),
+            "data": self.data,
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class TraceSpan:
     name: str
     status: str = "in_progress"
-    started_at: str = field(default_factory=_utc_now_iso)
-    started_at_monotonic: float = field(default_factory=time.monotonic)
-    finished_at: str | None = None
+    # Raw floats at creation; ISO formatting is deferred to as_dict() so
+    # spans that never persist pay nothing for it.
+    started_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
     duration_ms: int | None = None
     data: dict[str, Any] = field(default_factory=dict)
     events: list[TraceEvent] = field(default_factory=list)
     children: list["TraceSpan"] = field(default_factory=list)
 
     def event(self, name: str, status: str = "info", **data: Any) -> None:
-        self.events.append(TraceEvent(name=name, status=status, data=data))
+        # Sanitize once at ingest so as_dict() can dump without copying.
+        self.events.append(TraceEvent(name=name, status=status, data=_safe_value(data)))
 
     def child(self, name: str, **data: Any) -> "TraceSpan":
-        span = TraceSpan(name=name, data=data)
+        span = TraceSpan(name=name, data=_safe_value(data))
         self.children.append(span)
         return span
 
@@ -67,28 +99,38 @@ class TraceSpan:
         if self.finished_at is not None:
             return
         self.status = status
-        self.finished_at = _utc_now_iso()
-        self.duration_ms = int((time.monotonic() - self.started_at_monotonic) * 1000)
+        self.finished_at = time.time()
+        self.duration_ms = int((self.finished_at - self.started_at) * 1000)
         if data:
-            self.data.update(data)
+            self.data.update(_safe_value(data))
 
     def as_dict(self) -> dict[str, Any]:
         return {
             "name": self.name,
             "status": self.status,
-            "started_at": self.started_at,
-            "finished_at": self.finished_at,
+            "started_at": _iso(self.started_at),
+            "finished_at": _iso(self.finished_at) if self.finished_at is not None else None,
             "duration_ms": self.duration_ms,
-            "data": _safe_value(self.data),
+            "data": self.data,
             "events": [event.as_dict() for event in self.events],
-            "children": [child.as_dict() for child in self.children],
+            # Abandoned spans (never finished, no events) carry no signal;
+            # skipping them trims the payload on abort paths.
+            "children": [
+                child.as_dict()
+                for child in self.children
+                if child.finished_at is not None or child.events
+            ],
         }
 
 
 class RequestTrace:
+    # Traces are created per Slack event and spans/events in large numbers
+    # under them; slots drop the per-instance __dict__ overhead.
+    __slots__ = ("request_id", "metadata", "started_at", "root")
+
     def __init__(self, request_id: str, metadata: dict[str, Any] | None = None):
         self.request_id = request_id
-        self.metadata = metadata or {}
+        self.metadata = _safe_value(metadata or {})
         self.started_at = _utc_now_iso()
         self.root = TraceSpan(name="request.lifecycle")
 
@@ -96,20 +138,36 @@ class RequestTrace:
         self.root.event(name=name, status=status, **data)
 
     def span(self, name: str, **data: Any) -> TraceSpan:
+        """Open a child span under the request root.
+
+        Call finish() on the returned span when the work completes; spans
+        that are never finished and record no events are dropped from the
+        persisted trace.
+        """
         return self.root.child(name, **data)
 
     def as_dict(self) -> dict[str, Any]:
         return {
             "request_id": self.request_id,
             "started_at": self.started_at,
-            "metadata": _safe_value(self.metadata),
+            "metadata": self.metadata,
             "trace": self.root.as_dict(),
         }
 
 
 class TraceStore:
     def __init__(self):
-        pass
+        # Compact NDJSON is the default: one line per trace, one write
+        # syscall, and no indent processing. TRACE_PRETTY=1 restores the
+        # human-readable block format for local debugging.
+        self._pretty = os.getenv("TRACE_PRETTY") == "1"
+        # Serialization and stdout writes happen on a background thread so
+        # persist() returns immediately and the Slack handler never waits on
+        # trace output.
+        self._queue: queue.Queue[RequestTrace] = queue.Queue(maxsize=1024)
+        self._thread = threading.Thread(target=self._drain, name="trace-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
 
     def create(self, metadata: dict[str, Any] | None = None) -> RequestTrace:
         return RequestTrace(request_id=str(uuid.uuid4()), metadata=metadata)
@@ -117,7 +175,41 @@ class TraceStore:
     def persist(self, trace: RequestTrace) -> None:
         if trace.root.finished_at is None:
             trace.root.finish(status=trace.root.status)
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            # Drop the oldest trace rather than blocking the request path.
+            try:
+                self._queue.get_nowait()
+                self._queue.task_done()
+            except queue.Empty:
+                pass
+            try:
+                self._queue.put_nowait(trace)
+            except queue.Full:
+                pass
+
+    def flush(self) -> None:
+        """Block until every queued trace has been written."""
+        self._queue.join()
+
+    def _drain(self) -> None:
+        while True:
+            trace = self._queue.get()
+            try:
+                self._write(trace)
+            except Exception:
+                # A malformed trace must not kill the writer thread.
+                pass
+            finally:
+                self._queue.task_done()
+
+    def _write(self, trace: RequestTrace) -> None:
         payload = trace.as_dict()
-        print("TRACE_START")
-        print(json.dumps(payload, indent=2, ensure_ascii=False))
-        print("TRACE_END")
+        if self._pretty:
+            print("TRACE_START")
+            print(dumps_pretty(payload))
+            print("TRACE_END")
+            return
+        sys.stdout.buffer.write(b"TRACE " + dumps_bytes(payload) + b"\n")
+        sys.stdout.buffer.flush()